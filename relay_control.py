@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import ttk
-import serial
-import time
 import os
-import pyudev
-from typing import Optional, NoReturn
+import sys
+import time
+import json
+import fcntl
+import struct
+import termios
+import threading
+import queue
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Optional, NoReturn
+
+if TYPE_CHECKING:
+    # Imported lazily by RelayControl._finish_init to show the window sooner
+    import pyudev
+    import serial
 
 class RelayControl:
     """
@@ -27,6 +40,43 @@ class RelayControl:
         device_path (Optional[str]): Path to the USB device
     """
     
+    # USB vendor and product IDs of compatible relay modules (CH340, CH341)
+    COMPATIBLE_USB_IDS = (('1a86', '7523'), ('1a86', '5523'))
+    # Kernel driver used by CH34x USB serial converters
+    CH34X_DRIVER = 'ch341'
+    # Relay commands indexed by the target state (0 = OFF, 1 = ON)
+    _CMDS = (b'\xA0\x01\x00\xA1', b'\xA0\x01\x01\xA2')
+    # Time the relay needs to switch before the new state is shown, in ms
+    RELAY_SETTLE_MS = 100
+    # Time the port needs after opening before stale data can be flushed, in ms
+    OPEN_SETTLE_MS = 500
+    # Layout of the kernel's struct serial_struct; the flags field is the fifth member
+    _SERIAL_STRUCT = 'iiIiiiiiHcciHHPHIL'
+    _ASYNC_LOW_LATENCY = 0x2000
+    # Status label and control button options for each UI state
+    _UI_STATES = {
+        'error': dict(
+            label_kw={'text': "Error", 'style': 'StatusError.TLabel'},
+            button_kw={'text': "Retry", 'state': 'normal'}
+        ),
+        'ok_off': dict(
+            label_kw={'text': "OFF", 'style': 'StatusOff.TLabel'},
+            button_kw={'text': "Turn ON", 'state': 'normal'}
+        ),
+        'ok_on': dict(
+            label_kw={'text': "ON", 'style': 'StatusOn.TLabel'},
+            button_kw={'text': "Turn OFF", 'state': 'normal'}
+        ),
+    }
+    # Directory of the persistent udev links for serial devices
+    BY_ID_DIR = '/dev/serial/by-id/'
+    # File remembering the last successfully opened relay device
+    DEVICE_CACHE_FILE = os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+        'ost_telescope_tools',
+        'relay_device.json'
+    )
+    
     def __init__(self, root: tk.Tk) -> None:
         """
         Initialize the RelayControl application.
@@ -51,28 +101,40 @@ class RelayControl:
         self.relay_status = False
         self.serial_port: Optional[serial.Serial] = None
         self.device_path: Optional[str] = None
+        self._opening = False
+        self._settle_job: Optional[str] = None
+        self._ack_fd: Optional[int] = None
         
-        # Create main frame
-        self.main_frame = ttk.Frame(self.root, padding="20")
-        self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
+        # udev context and cache of compatible tty devices, kept current by a monitor
+        self._udev_ctx: Optional[pyudev.Context] = None
+        self._tty_cache: dict[str, pyudev.Device] = {}
+        self._udev_observer: Optional[pyudev.MonitorObserver] = None
+        self._tty_cache_ready = False
         
-        # Configure styles
+        # Handlers posted by background threads, run on the Tk thread. The pipe wakes
+        # up the Tk event loop whenever a handler is posted.
+        self._events: queue.Queue = queue.Queue()
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_read, False)
+        os.set_blocking(self._wakeup_write, False)
+        self.root.tk.createfilehandler(self._wakeup_read, tk.READABLE, self._process_events)
+        
+        # Relay device remembered from an earlier session
+        self._known_device = self._load_known_device()
+        
+        # Dark styles for what is shown first; the rest follows in _configure_styles
         style = ttk.Style()
         style.configure('TFrame', background=self.bg_color)
-        style.configure('TLabel', 
-                       background=self.bg_color,
-                       foreground=self.fg_color,
-                       font=('Helvetica', 12))
         style.configure('Title.TLabel',
                        background=self.bg_color,
                        foreground=self.fg_color,
                        font=('Helvetica', 18, 'bold'))
-        style.configure('Accent.TButton',
-                       background=self.accent_color,
-                       foreground=self.fg_color,
-                       font=('Helvetica', 12))
+        
+        # Create main frame
+        self.main_frame = ttk.Frame(self.root, padding="20")
+        self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
         
         # Title label
         self.title_label = ttk.Label(
@@ -82,6 +144,10 @@ class RelayControl:
         )
         self.title_label.grid(row=0, column=0, pady=(0, 10))
         
+        # Show the window before the remaining setup
+        self.root.update_idletasks()
+        self._configure_styles()
+        
         # Description label
         self.description_label = ttk.Label(
             self.main_frame,
@@ -114,8 +180,7 @@ class RelayControl:
         self.status_label = ttk.Label(
             self.status_frame,
             text="OFF",
-            font=('Helvetica', 12, 'bold'),
-            foreground=self.error_color
+            style='StatusOff.TLabel'
         )
         self.status_label.grid(row=0, column=1)
         
@@ -124,83 +189,442 @@ class RelayControl:
             self.main_frame,
             text="Turn ON",
             command=self.toggle_relay,
-            style='Accent.TButton'
+            style='Accent.TButton',
+            state='disabled'
         )
         self.control_button.grid(row=4, column=0, pady=20, ipady=5)
         
+        # Set up device access once the window is shown. Tk runs timers before idle
+        # handlers, so the widgets are laid out and drawn explicitly first.
+        self._serial: Optional[ModuleType] = None
+        self._pyudev: Optional[ModuleType] = None
+        self.root.update_idletasks()
+        self.root.after(0, self._finish_init)
+    
+    def _finish_init(self) -> None:
+        """
+        Import the device libraries and connect to the relay device.
+        
+        pyudev and pyserial take a noticeable time to import on small machines, so this
+        is done from the Tk event loop after the window has been shown.
+        """
+        import pyudev
+        import serial
+        self._pyudev = pyudev
+        self._serial = serial
+        self._udev_ctx = pyudev.Context()
+        
+        # Watch for hot-plug events
+        self._start_udev_monitor()
+        
         # Initialize device detection
         self.find_ch340_device()
         
         # Initialize serial connection
         self.initialize_serial()
+    
+    def _configure_styles(self) -> None:
+        """
+        Configure the ttk styles of the dark theme for the widgets below the title.
+        
+        The styles of the main frame and the title are set up in __init__ before the
+        window is first shown.
+        """
+        style = ttk.Style()
+        style.configure('TLabel', 
+                       background=self.bg_color,
+                       foreground=self.fg_color,
+                       font=('Helvetica', 12))
+        style.configure('Accent.TButton',
+                       background=self.accent_color,
+                       foreground=self.fg_color,
+                       font=('Helvetica', 12))
+        # Status label variants, switched as a whole instead of per option
+        for style_name, color in (('StatusOn.TLabel', self.success_color),
+                                  ('StatusOff.TLabel', self.error_color),
+                                  ('StatusError.TLabel', self.error_color)):
+            style.configure(style_name,
+                           background=self.bg_color,
+                           foreground=color,
+                           font=('Helvetica', 12, 'bold'))
+    
+    @classmethod
+    def _is_compatible(cls, device: pyudev.Device) -> bool:
+        """
+        Check whether a udev device belongs to a CH340/CH341 USB relay module.
+        
+        The check only reads udev properties, so nothing is written to the device.
+        
+        Args:
+            device (pyudev.Device): The udev device to check
+            
+        Returns:
+            bool: True if the USB IDs are known or the device uses the CH34x driver
+        """
+        usb_ids = (device.get('ID_VENDOR_ID'), device.get('ID_MODEL_ID'))
+        return usb_ids in cls.COMPATIBLE_USB_IDS or device.get('ID_USB_DRIVER') == cls.CH34X_DRIVER
+    
+    @classmethod
+    def _has_ch34x_link(cls, device: pyudev.Device) -> bool:
+        """
+        Check whether one of the persistent by-id links of a device names a CH34x chip.
+        
+        Args:
+            device (pyudev.Device): The udev device to check
+            
+        Returns:
+            bool: True if a /dev/serial/by-id link matches CH34*
+        """
+        for link in device.get('DEVLINKS', '').split():
+            if link.startswith(cls.BY_ID_DIR) and 'ch34' in os.path.basename(link).lower():
+                return True
+        return False
+    
+    def _populate_tty_cache(self) -> None:
+        """
+        Fill the device cache with the compatible tty devices currently present.
+        
+        The driver and vendor IDs are handed to libudev so that unrelated devices are
+        skipped before they reach Python. libudev combines property matches with a
+        logical OR, so every result is still checked with _is_compatible.
+        """
+        enumerator = self._udev_ctx.list_devices(subsystem='tty', ID_USB_DRIVER=self.CH34X_DRIVER)
+        for vendor_id in {vendor_id for vendor_id, _ in self.COMPATIBLE_USB_IDS}:
+            enumerator.match_property('ID_VENDOR_ID', vendor_id)
+        
+        for device in enumerator:
+            if device.device_node is not None and self._is_compatible(device):
+                self._tty_cache[device.device_node] = device
+        self._tty_cache_ready = True
+    
+    def _start_udev_monitor(self) -> None:
+        """
+        Start a background observer that keeps the device cache in sync with hot-plug events.
+        """
+        monitor = self._pyudev.Monitor.from_netlink(self._udev_ctx)
+        monitor.filter_by('tty')
+        self._udev_observer = self._pyudev.MonitorObserver(monitor, callback=self._on_udev_event)
+        self._udev_observer.start()
+    
+    def _post(self, handler: Callable[..., None], *args: Any) -> None:
+        """
+        Run a handler on the Tk thread.
+        
+        This method can be called from any thread. The handler is queued and the Tk
+        event loop is woken up through the wakeup pipe, so no polling is needed.
+        
+        Args:
+            handler (Callable[..., None]): The method to run on the Tk thread
+            *args: Arguments passed to the handler
+        """
+        self._events.put((handler, args))
+        try:
+            os.write(self._wakeup_write, b'\0')
+        except BlockingIOError:
+            # The pipe is full, so the Tk thread is already due to wake up
+            pass
+    
+    def _process_events(self, fd: int, mask: int) -> None:
+        """
+        Run all handlers posted by background threads.
+        
+        Tk calls this method when the wakeup pipe becomes readable.
+        
+        Args:
+            fd (int): File descriptor of the wakeup pipe
+            mask (int): Tk file event mask
+        """
+        try:
+            os.read(fd, 4096)
+        except BlockingIOError:
+            pass
+        
+        while True:
+            try:
+                handler, args = self._events.get_nowait()
+            except queue.Empty:
+                break
+            # Report a failing handler like any Tk callback, but keep going so that
+            # the remaining events are not left without a wakeup
+            try:
+                handler(*args)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+    
+    def _on_udev_event(self, device: pyudev.Device) -> None:
+        """
+        Pass a udev tty event on to the Tk thread.
+        
+        This method runs in the observer thread and must not touch widgets or the device
+        cache. The event is handled by _handle_udev_event.
+        
+        Args:
+            device (pyudev.Device): The device the event refers to
+        """
+        if device.device_node is not None:
+            self._post(self._handle_udev_event, device.action, device)
+    
+    def _handle_udev_event(self, action: str, device: pyudev.Device) -> None:
+        """
+        Update the device cache for a udev tty event.
+        
+        When a compatible device appears or the current device disappears, the matching
+        handler is called.
+        
+        Args:
+            action (str): The udev action, e.g. 'add' or 'remove'
+            device (pyudev.Device): The device the event refers to
+        """
+        device_node = device.device_node
+        if action == 'add' and self._is_compatible(device):
+            self._tty_cache[device_node] = device
+            self._on_device_arrived()
+        elif action == 'remove':
+            self._tty_cache.pop(device_node, None)
+            if device_node == self.device_path:
+                self._on_device_lost()
+    
+    def _on_device_arrived(self) -> None:
+        """
+        Connect to a newly plugged in relay device if there is no active connection.
+        
+        While a port is still being opened, the current device_path is kept, so that the
+        opened port and the device shown and remembered belong to the same board.
+        """
+        if self.serial_port is None and not self._opening:
+            self.find_ch340_device()
+            self.initialize_serial()
+    
+    def _on_device_lost(self) -> None:
+        """
+        Handle the removal of the relay device.
+        
+        This method closes the serial connection and switches to another compatible
+        device if one is present. Otherwise it shows an error status.
+        """
+        if self.serial_port is not None:
+            self._end_settle_wait()
+            self.serial_port.close()
+            self.serial_port = None
         
-        # Check connection status periodically
-        self.root.after(1000, self.check_connection)
+        self.find_ch340_device()
+        if self.device_path is None:
+            self._set_state('error')
+        else:
+            self.initialize_serial()
     
     def find_ch340_device(self) -> None:
         """
         Find and initialize the CH340 USB relay device.
         
-        This method searches for the CH340 device in the system and sets the device_path
-        if found. It first looks for the specific CH340 device by vendor and product IDs,
-        and if not found, it tries to communicate with any ttyUSB device to find a compatible
-        relay module.
+        This method first tries the device remembered from an earlier session, which
+        only costs a stat() call. Otherwise it sets the device_path to a compatible device
+        from the device cache, which is filled on first use and then kept up to date by
+        the udev monitor. The cache is walked once in device node order: the first device
+        with a by-id link naming a CH34x chip is taken, otherwise the first compatible
+        device. Devices are identified by their udev properties only; nothing is written
+        to them.
         """
-        context = pyudev.Context()
-        for device in context.list_devices(subsystem='tty'):
-            if device.get('ID_VENDOR_ID') == '1a86' and device.get('ID_MODEL_ID') == '7523':  # CH340 vendor and product IDs
-                self.device_path = device.device_node
-                self.device_info.config(text=f"Device: {self.device_path}")
-                return
+        if self._known_device is not None and os.path.exists(self._known_device['device_path']):
+            self.device_path = os.path.realpath(self._known_device['device_path'])
+            self.device_info.configure(text=f"Device: {self.device_path}", foreground=self.fg_color)
+            return
         
-        # If no device found, check all ttyUSB devices
-        for device in context.list_devices(subsystem='tty'):
-            if 'ttyUSB' in device.device_node:
-                try:
-                    with serial.Serial(device.device_node, timeout=1) as ser:
-                        # Try to communicate with the device
-                        ser.write(b'\xA0\x01\x00\xA1')  # Try to turn off
-                        time.sleep(0.1)
-                        self.device_path = device.device_node
-                        self.device_info.config(text=f"Device: {self.device_path}")
-                        return
-                except:
-                    continue
+        if not self._tty_cache_ready:
+            self._populate_tty_cache()
+        
+        candidate = None
+        for device_node in sorted(self._tty_cache):
+            if self._has_ch34x_link(self._tty_cache[device_node]):
+                candidate = device_node
+                break
+            if candidate is None:
+                candidate = device_node
+        
+        if candidate is not None:
+            self.device_path = candidate
+            self.device_info.configure(text=f"Device: {self.device_path}", foreground=self.fg_color)
+            return
         
         self.device_path = None
-        self.device_info.config(text="Device: Not found", foreground=self.error_color)
+        self.device_info.configure(text="Device: Not found", foreground=self.error_color)
     
     def initialize_serial(self) -> None:
         """
         Initialize the serial connection to the relay device.
         
-        This method attempts to establish a serial connection with the relay device.
-        If successful, it updates the UI to reflect the connection status. If it fails,
-        it disables the control button and shows an error status.
+        Opening a USB serial port can block for a noticeable time, so this method opens
+        the port in a worker thread and disables the control button meanwhile. The result
+        is handled on the Tk thread by _on_serial_ready or _on_serial_error. Calls made
+        while the port is still being opened are ignored.
         """
-        try:
-            if self.serial_port is not None:
-                self.serial_port.close()
-            
+        if self._opening:
+            return
+        
+        if self.serial_port is not None:
+            self._end_settle_wait()
+            self.serial_port.close()
+            self.serial_port = None
+        
+        if self.device_path is None:
+            self.find_ch340_device()
             if self.device_path is None:
-                self.find_ch340_device()
-                if self.device_path is None:
-                    raise serial.SerialException("Device not found")
-            
-            self.serial_port = serial.Serial(
-                port=self.device_path,
+                self._on_serial_error(self._serial.SerialException("Device not found"))
+                return
+        
+        self._opening = True
+        self.control_button.configure(state='disabled')
+        threading.Thread(
+            target=self._open_serial_worker,
+            args=(self.device_path,),
+            daemon=True
+        ).start()
+    
+    def _open_serial_worker(self, device_path: str) -> None:
+        """
+        Open the serial port and hand the result over to the Tk thread.
+        
+        This method runs in a worker thread started by initialize_serial. After opening,
+        it waits OPEN_SETTLE_MS and then discards both buffers, so that bytes left over
+        from before the open are not mistaken for replies to the next command.
+        
+        Args:
+            device_path (str): Path to the USB device
+        """
+        serial = self._serial
+        ser = None
+        try:
+            ser = serial.Serial(
+                port=device_path,
                 baudrate=9600,
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
-                timeout=1
+                timeout=1,
+                exclusive=True
             )
-            self.update_status(False)
-            self.control_button.config(state='normal')
-        except serial.SerialException as e:
-            self.status_label.config(text="Error", foreground=self.error_color)
-            self.control_button.config(state='disabled')
-            self.serial_port = None
+            self._set_low_latency(ser)
+            time.sleep(self.OPEN_SETTLE_MS / 1000)
+            ser.reset_input_buffer()
+            ser.reset_output_buffer()
+        except (serial.SerialException, termios.error, OSError) as e:
+            # The buffer resets raise termios.error, e.g. when the board is unplugged
+            # while the port settles
+            if ser is not None:
+                try:
+                    ser.close()
+                except (serial.SerialException, OSError):
+                    pass
+            self._post(self._on_serial_error, e)
+        else:
+            self._post(self._on_serial_ready, ser)
+    
+    @classmethod
+    def _set_low_latency(cls, ser: serial.Serial) -> None:
+        """
+        Ask the USB serial driver to send written data without buffering delay.
+        
+        This sets the ASYNC_LOW_LATENCY flag through TIOCGSERIAL/TIOCSSERIAL. Drivers
+        that do not support these requests are left unchanged.
+        
+        Args:
+            ser (serial.Serial): The opened serial connection
+        """
+        buf = bytearray(struct.calcsize(cls._SERIAL_STRUCT))
+        flags_offset = struct.calcsize(cls._SERIAL_STRUCT[:4])
+        try:
+            fcntl.ioctl(ser.fileno(), termios.TIOCGSERIAL, buf)
+            flags = struct.unpack_from('i', buf, flags_offset)[0] | cls._ASYNC_LOW_LATENCY
+            struct.pack_into('i', buf, flags_offset, flags)
+            fcntl.ioctl(ser.fileno(), termios.TIOCSSERIAL, buf)
+        except OSError:
+            pass
+    
+    def _on_serial_ready(self, ser: serial.Serial) -> None:
+        """
+        Use a freshly opened serial connection and enable the controls.
+        
+        Args:
+            ser (serial.Serial): The opened serial connection
+        """
+        self._opening = False
+        self.serial_port = ser
+        self._save_known_device()
+        self.update_status(False)
+    
+    def _on_serial_error(self, error: Exception) -> None:
+        """
+        Show an error status after the serial connection could not be opened.
+        
+        Args:
+            error (Exception): The error raised while opening the port
+        """
+        self._opening = False
+        if (self._known_device is not None and self.device_path is not None
+                and os.path.realpath(self._known_device['device_path']) == self.device_path):
+            self._forget_known_device()
+        self._set_state('error')
+        self.serial_port = None
+    
+    def _load_known_device(self) -> Optional[dict[str, str]]:
+        """
+        Load the relay device remembered from an earlier session.
+        
+        Returns:
+            Optional[dict[str, str]]: The cache entry with the by-id device path, or None
+            if there is no usable entry
+        """
+        try:
+            with open(self.DEVICE_CACHE_FILE) as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(entry, dict) or not isinstance(entry.get('device_path'), str):
+            return None
+        if not entry['device_path'].startswith(self.BY_ID_DIR):
+            return None
+        return entry
+    
+    def _save_known_device(self) -> None:
+        """
+        Remember the current relay device for the next session.
+        
+        Only the persistent /dev/serial/by-id link is stored. A ttyUSB number can belong
+        to a different serial device after a reboot or replug, so devices without such a
+        link are not remembered.
+        """
+        device = self._tty_cache.get(self.device_path)
+        if device is None:
+            # Device was taken from the cache file, which is still valid
+            return
+        
+        by_id_links = [link for link in device.get('DEVLINKS', '').split()
+                       if link.startswith(self.BY_ID_DIR)]
+        if not by_id_links:
+            return
+        
+        entry = {'device_path': by_id_links[0]}
+        if entry == self._known_device:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self.DEVICE_CACHE_FILE), exist_ok=True)
+            with open(self.DEVICE_CACHE_FILE, 'w') as cache_file:
+                json.dump(entry, cache_file)
+        except OSError:
+            return
+        self._known_device = entry
+    
+    def _forget_known_device(self) -> None:
+        """
+        Remove the remembered relay device after it failed to open.
+        """
+        self._known_device = None
+        try:
+            os.remove(self.DEVICE_CACHE_FILE)
+        except OSError:
+            pass
     
     def update_status(self, status: bool) -> None:
         """
@@ -210,61 +634,90 @@ class RelayControl:
             status (bool): The new status of the relay (True = ON, False = OFF)
         """
         self.relay_status = status
-        if status:
-            self.status_label.config(text="ON", foreground=self.success_color)
-            self.control_button.config(text="Turn OFF")
-        else:
-            self.status_label.config(text="OFF", foreground=self.error_color)
-            self.control_button.config(text="Turn ON")
+        self._set_state('ok_on' if status else 'ok_off')
     
-    def check_connection(self) -> None:
+    def _set_state(self, state: str) -> None:
         """
-        Periodically check the connection to the relay device.
+        Update the status label and the control button for a UI state.
         
-        This method is called every second to verify that the device is still connected
-        and the serial connection is working. If the device is disconnected or the
-        connection is lost, it attempts to reinitialize the connection.
-        """
-        if self.device_path is None or not os.path.exists(self.device_path):
-            self.find_ch340_device()
-            if self.device_path is None:
-                self.status_label.config(text="Error", foreground=self.error_color)
-                self.control_button.config(state='disabled')
-                self.serial_port = None
-        elif self.serial_port is None:
-            self.initialize_serial()
+        Each widget is updated with a single configure call. In the 'error' state the
+        control button stays enabled and retries the connection when pressed.
         
-        self.root.after(1000, self.check_connection)
+        Args:
+            state (str): One of 'error', 'ok_off' or 'ok_on'
+        """
+        options = self._UI_STATES[state]
+        self.status_label.configure(**options['label_kw'])
+        self.control_button.configure(**options['button_kw'])
     
     def toggle_relay(self) -> None:
         """
         Toggle the relay state between ON and OFF.
         
         This method sends the appropriate command to the relay device to change its state.
-        If the serial connection is not established, it attempts to initialize it first.
+        If the serial connection is not established, e.g. after an error, it retries to
+        initialize it instead.
         If an error occurs during the operation, it updates the UI to show the error state.
         """
-        if self.serial_port is None:
+        serial_port = self.serial_port
+        if serial_port is None:
             self.initialize_serial()
             return
         
         try:
-            if not self.relay_status:
-                # Turn relay ON
-                self.serial_port.write(b'\xA0\x01\x01\xA2')
-                self.serial_port.flush()
-                time.sleep(0.1)
-                self.update_status(True)
-            else:
-                # Turn relay OFF
-                self.serial_port.write(b'\xA0\x01\x00\xA1')
-                self.serial_port.flush()
-                time.sleep(0.1)
-                self.update_status(False)
-        except serial.SerialException as e:
-            self.status_label.config(text="Error", foreground=self.error_color)
+            new_state = not self.relay_status
+            # Drop replies to earlier commands, so that they neither pile up nor
+            # count as the acknowledgement of this one
+            serial_port.reset_input_buffer()
+            serial_port.write(self._CMDS[new_state])
+            # Finish as soon as the board acknowledges the command, or after the
+            # settle time for boards without acknowledgement. Tk watches the port
+            # in its own event loop, so the GUI stays responsive meanwhile.
+            self.control_button.configure(state='disabled')
+            self._ack_fd = serial_port.fileno()
+            self.root.tk.createfilehandler(
+                self._ack_fd, tk.READABLE,
+                lambda fd, mask: self._finish_toggle(new_state)
+            )
+            self._settle_job = self.root.after(self.RELAY_SETTLE_MS, self._finish_toggle, new_state)
+        except (self._serial.SerialException, termios.error) as e:
+            self._set_state('error')
+            # Release the exclusive lock before the port is opened again
+            self._end_settle_wait()
+            try:
+                serial_port.close()
+            except (self._serial.SerialException, OSError):
+                pass
             self.serial_port = None
             self.initialize_serial()
+    
+    def _finish_toggle(self, new_state: bool) -> None:
+        """
+        Show the new relay state once the relay has acknowledged or settled.
+        
+        Args:
+            new_state (bool): The state the relay was switched to
+        """
+        self._end_settle_wait()
+        if self.serial_port is None:
+            return
+        
+        self.update_status(new_state)
+    
+    def _end_settle_wait(self) -> None:
+        """
+        Stop waiting for the relay to acknowledge or settle, if a wait is in progress.
+        
+        This must be called before the serial port is closed, so that Tk does not keep
+        watching a closed file descriptor.
+        """
+        if self._settle_job is None:
+            return
+        
+        self.root.after_cancel(self._settle_job)
+        self.root.tk.deletefilehandler(self._ack_fd)
+        self._settle_job = None
+        self._ack_fd = None
 
 if __name__ == "__main__":
     root = tk.Tk()